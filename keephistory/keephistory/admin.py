@@ -8,6 +8,9 @@ class TaskAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
 
 class ReaOnlyModelAdminMixin:
+    # Nothing can be changed, so skip rendering the actions dropdown.
+    actions = None
+
     def has_add_permission(self, *args, **kwargs):
         return False
 
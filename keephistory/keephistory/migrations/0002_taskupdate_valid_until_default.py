@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-14 13:26
+
+from django.db import migrations, models
+import keephistory.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keephistory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskupdate',
+            name='valid_until',
+            field=models.DateTimeField(default=keephistory.models.get_max_datetime),
+        ),
+    ]
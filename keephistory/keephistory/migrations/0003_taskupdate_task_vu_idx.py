@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-14 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keephistory', '0002_taskupdate_valid_until_default'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskupdate',
+            index=models.Index(fields=['task', 'valid_until'], name='taskupdate_task_vu_idx'),
+        ),
+    ]
@@ -1,11 +1,13 @@
 import datetime
-from functools import wraps
+import threading
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from operator import attrgetter
 from typing import Callable
 import django
 
-from django.db import models
+from django.db import connection, connections, models, router, transaction
 from django.utils.timezone import now
-from django.utils.dateparse import parse_datetime
 from enum import Enum
 
 class OperationType(Enum):
@@ -14,7 +16,11 @@ class OperationType(Enum):
     DELETE = 'D'
     SAVE = 'S'
 
-MAX_DATETIME = parse_datetime('3000-12-31T23:59:59.999999Z')
+MAX_DATETIME = datetime.datetime(3000, 12, 31, 23, 59, 59, 999999, tzinfo=datetime.timezone.utc)
+
+def get_max_datetime() -> datetime.datetime:
+    """Get MAX_DATETIME. Used as a field default, so migrations reference it instead of copying the value."""
+    return MAX_DATETIME
 
 class TaskBaseModel(models.Model):
     title = models.CharField(max_length=128)
@@ -25,9 +31,58 @@ class TaskBaseModel(models.Model):
     def __str__(self):
         return f'{self.__class__.__name__} {self.id}: {self.title}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the values as loaded, so find_change_type() can detect
+        # changes without fetching the row again.
+        instance = super().from_db(db, field_names, values)
+        instance._original_state = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            remember_state(self)
+        else:
+            original_state = getattr(self, '_original_state', None) or {}
+            for name in fields:
+                attname = self._meta.get_field(name).attname
+                original_state[attname] = getattr(self, attname)
+            self._original_state = original_state
+
+    def get_dirty_fields(self):
+        """Get attribute names of fields changed since the instance was loaded or saved.
+
+        Returns:
+            set: Changed field attribute names, or None if persisted state is not known.
+        """
+        return dirty_fields(self)
+
     class Meta:
         abstract = True
 
+@lru_cache(maxsize=None)
+def model_field_names(model, include_pk=True) -> tuple:
+    """Get field names of Django Model class. Computed once per model class.
+
+    Args:
+        model (Type[django.db.models.Model]): Model class to get field names for.
+        include_pk (bool): Set to True to include the Primary Key name in the output.
+                To exclude the Primary Key, set to False.
+    """
+    pk_name = model._meta.pk.name
+    return tuple(f.name for f in model._meta.fields if f.name != pk_name or include_pk)
+
+@lru_cache(maxsize=None)
+def model_field_attnames(model) -> tuple:
+    """Get attribute names of Django Model class concrete fields, except the Primary Key.
+    Computed once per model class.
+
+    Args:
+        model (Type[django.db.models.Model]): Model class to get attribute names for.
+    """
+    return tuple(f.attname for f in model._meta.concrete_fields if not f.primary_key)
+
 def field_values(instance: models.Model, include_pk=True) -> dict:
     """Create dictionary with field values from Django Model object/instance.
     
@@ -36,15 +91,43 @@ def field_values(instance: models.Model, include_pk=True) -> dict:
         include_pk (bool): Set to True to include the Primary Key value in the output.
                 To exclude the Primary Key, set to False.
     """
-    pk_name = instance._meta.pk.name
-    field_names = [f.name for f in instance._meta.fields if f.name != pk_name or include_pk]
-    return { fn:getattr(instance, fn) for fn in field_names }
+    return { fn:getattr(instance, fn) for fn in model_field_names(instance.__class__, include_pk) }
+
+def dirty_fields(instance: models.Model, update_fields=None):
+    """Find fields changed since Django model instance was loaded or saved.
+
+    Compares against the values remembered at load time (see TaskBaseModel.from_db)
+    or after the last save (see remember_state), so no query is made.
+
+    Args:
+       instance (django.db.models.Model): Instance to test.
+       update_fields (Iterable[str]): Optional. Names of the fields to test. All fields by default.
+
+    Returns:
+       set: Changed field attribute names, or None if persisted state is not known.
+    """
+    original_state = getattr(instance, '_original_state', None)
+    if original_state is None:
+        return None
+    attnames = model_field_attnames(instance.__class__)
+    if update_fields is not None:
+        attnames = {instance._meta.get_field(name).attname for name in update_fields}
+    dirty = set()
+    for attname in attnames:
+        if attname in original_state:
+            if getattr(instance, attname) != original_state[attname]:
+                dirty.add(attname)
+        elif attname in instance.__dict__:
+            # Deferred field which was assigned since.
+            dirty.add(attname)
+    return dirty
 
-def find_change_type(instance: models.Model):
+def find_change_type(instance: models.Model, update_fields=None):
     """Detect if Django model instance is different than currently persisted.
     
     Args:
        instance (django.db.models.Model): Instance to test.
+       update_fields (Iterable[str]): Optional. Names of the fields to test. All fields by default.
 
     Returns:
        OperationType: The type of change.
@@ -54,17 +137,236 @@ def find_change_type(instance: models.Model):
     if pk is None:
         return OperationType.INSERT
 
-    model = instance.__class__
+    if getattr(instance, '_original_state', None) is None:
+        # Persisted state is not known. Look it up once and remember it.
+        model = instance.__class__
+        try:
+            old_instance = model.objects.only(*model_field_names(model, False)).get(**{pk_name:pk})
+        except model.DoesNotExist:
+            return OperationType.INSERT
+        attnames = model_field_attnames(model)
+        current_values = tuple(getattr(old_instance, attname) for attname in attnames)
+        instance._original_state = dict(zip(attnames, current_values))
+        if update_fields is None:
+            new_values = tuple(getattr(instance, attname) for attname in attnames)
+            return OperationType.UPDATE if current_values != new_values else OperationType.SAVE
+
+    dirty = dirty_fields(instance, update_fields)
+    return OperationType.UPDATE if dirty else OperationType.SAVE
+
+def remember_state(instance: models.Model, update_fields=None):
+    """Store current field values of instance as its persisted state.
+
+    Args:
+        instance (django.db.models.Model): Instance that has just been saved.
+        update_fields (Iterable[str]): Optional. Names of the fields that were saved.
+                Other fields keep their remembered state, so they are still saved later.
+    """
+    if update_fields is None:
+        attnames = model_field_attnames(instance.__class__)
+        original_state = {}
+    else:
+        original_state = getattr(instance, '_original_state', None)
+        if original_state is None:
+            # Persisted state of the other fields is not known. It is looked up on next save.
+            return
+        attnames = {instance._meta.get_field(name).attname for name in update_fields}
+    for attname in attnames:
+        if attname in instance.__dict__:
+            original_state[attname] = instance.__dict__[attname]
+    instance._original_state = original_state
+
+def history_values(instance: models.Model,
+                   change_type: OperationType,
+                   now_ts: datetime.datetime,
+                   fk_field:str=None,
+                   operation_field:str=None,
+                   valid_from_field:str=None,
+                   valid_until_field:str=None,
+                   max_datetime:datetime.datetime=None,
+                   update_fields=None) -> dict:
+    """Create dictionary with field values for a new history record.
+
+    Args:
+        instance (django.db.models.Model): Instance the history record is created for.
+        change_type (OperationType): The type of change.
+        now_ts (datetime.datetime): Timestamp the record is valid from.
+        update_fields (Iterable[str]): Optional. Names of the fields that were saved.
+                Other fields are recorded with their persisted values.
+
+    See with_history() for the rest of the arguments.
+    """
+    values = field_values(instance, False)
+    if update_fields is not None:
+        original_state = getattr(instance, '_original_state', None) or {}
+        saved = set(update_fields)
+        for field in instance._meta.concrete_fields:
+            if field.primary_key or field.name in saved or field.attname in saved:
+                continue
+            if field.attname in original_state:
+                values.pop(field.name, None)
+                values[field.attname] = original_state[field.attname]
+    if fk_field:
+        values[fk_field] = instance
+    if operation_field:
+        # _value_ is a plain attribute, .value goes through the Enum property descriptor.
+        values[operation_field] = change_type._value_
+    if valid_from_field:
+        values[valid_from_field] = now_ts
+    if valid_until_field:
+        values[valid_until_field] = max_datetime or MAX_DATETIME
+    return values
+
+_history_buffer = threading.local()
+
+def _savepoint_depth() -> int:
+    # atomic(savepoint=False) blocks push None, they cannot roll back on their own.
+    return sum(sid is not None for sid in connection.savepoint_ids)
+
+@contextmanager
+def history_batch(batch_size:int=1000):
+    """Context manager to create history records in bulk.
+
+    History records of with_history() decorated saves made inside the block are collected
+    and created with bulk_create() when the block exits without error. Nested blocks join
+    the outermost one.
+
+    The block runs in its own transaction.atomic(), so the saves and their history are
+    committed or rolled back together. Decorated saves in an atomic() block opened inside
+    the block, e.g. by get_or_create(), create their history record right away, so it is
+    rolled back together with that atomic() block.
+
+    Args:
+        batch_size (int): Optional. Number of history records created in a single query.
+    """
+    if getattr(_history_buffer, 'records', None) is not None:
+        yield
+        return
+    with transaction.atomic():
+        _history_buffer.records = []
+        # Collected records by (history model, primary key of the instance they are for).
+        _history_buffer.by_instance = {}
+        # Changes to collected records made in savepoints, see defer_history_change().
+        _history_buffer.pending = []
+        _history_buffer.batch_size = batch_size
+        _history_buffer.savepoint_depth = _savepoint_depth()
+        try:
+            yield
+            flush_history()
+        finally:
+            _history_buffer.records = None
+            _history_buffer.by_instance = None
+            _history_buffer.pending = None
+
+def _collecting_history() -> bool:
+    # Records are only collected directly in the history_batch() transaction, not in savepoints in it.
+    return (getattr(_history_buffer, 'records', None) is not None
+            and _savepoint_depth() == _history_buffer.savepoint_depth)
+
+def defer_history_change(change: Callable[[], None]):
+    """Apply a change to records collected by history_batch() once it is sure to be kept.
+
+    Directly in the history_batch() transaction the change is applied right away. Inside a
+    savepoint opened in it, the change is applied when the records are flushed, and only if
+    the savepoint was not rolled back.
+
+    Args:
+        change (Callable[[], None]): Function changing the collected records.
+    """
+    if _collecting_history():
+        change()
+        return
+    def marker():
+        pass
+    # Django discards on_commit() callbacks registered in a savepoint that is rolled back.
+    transaction.on_commit(marker)
+    _history_buffer.pending.append((marker, change))
+
+def close_buffered_history(history_model: django.db.models.Model, pks, valid_until_field:str, now_ts):
+    """Close records collected by history_batch() for instances with the given primary keys.
+
+    Args:
+        history_model (django.db.models.Model): Model used to store the history.
+        pks (Iterable): Primary keys of the instances.
+        valid_until_field (str): Field name to store now_ts to.
+        now_ts (datetime.datetime): Timestamp the records are valid until.
+    """
+    # Only the latest collected record of an instance can still be open.
+    latest = [staged[-1] for staged in (buffered_history(history_model, pk) for pk in pks) if staged]
+    if not latest:
+        return
+    def close():
+        for record in latest:
+            if getattr(record, valid_until_field) > now_ts:
+                setattr(record, valid_until_field, now_ts)
+    defer_history_change(close)
+
+def flush_history(batch_size:int=None):
+    """Create history records collected so far by history_batch(). No-op outside of it,
+    and inside a savepoint opened in it, since the records would be lost if it rolls back.
+
+    Args:
+        batch_size (int): Optional. Number of history records created in a single query.
+                If not provided, the batch_size of history_batch() is used.
+    """
+    if not _collecting_history():
+        return
+    pending = _history_buffer.pending
+    if pending:
+        kept = {entry[1] for entry in connection.run_on_commit}
+        for marker, change in pending:
+            if marker in kept:
+                change()
+        pending.clear()
+    records = _history_buffer.records
+    if not records:
+        return
+    by_model = {}
+    for record in records:
+        by_model.setdefault(record.__class__, []).append(record)
+    records.clear()
+    _history_buffer.by_instance.clear()
+    for history_model, model_records in by_model.items():
+        history_model.objects.bulk_create(model_records, batch_size=batch_size or _history_buffer.batch_size)
+
+_history_timestamp = threading.local()
+
+@contextmanager
+def history_timestamp(now_ts:datetime.datetime=None):
+    """Context manager to use one timestamp for all history maintained inside the block.
+
+    with_history() decorated saves and bulk_save_with_history() inside the block use now_ts
+    instead of reading it from now_field or calling now_func, so all history records of
+    a batch get the same valid from timestamp.
+
+    An instance saved more than once inside the block gets a record valid from now_ts until
+    now_ts for each save but the last one.
+
+    Args:
+        now_ts (datetime.datetime): Optional. Timestamp to use. If not provided,
+                django.utils.timezone.now() when entering the block is used.
+    """
+    previous = getattr(_history_timestamp, 'value', None)
+    _history_timestamp.value = now_ts or now()
     try:
-        old_instance = model.objects.get(**{pk_name:pk})
-    except model.DoesNotExist:
-        return OperationType.INSERT
+        yield _history_timestamp.value
+    finally:
+        _history_timestamp.value = previous
+
+def buffered_history(history_model: django.db.models.Model, pk) -> list:
+    """Get history records of history_model collected so far by history_batch() for an instance.
 
-    current_values = field_values(old_instance, False)
-    new_values = field_values(instance, False)
-    if current_values != new_values:
-        return OperationType.UPDATE
-    return OperationType.SAVE
+    Args:
+        history_model (django.db.models.Model): Model used to store the history.
+        pk: Primary key of the instance the records are for.
+
+    Returns:
+        list: Collected history records, oldest first. Empty outside of history_batch().
+    """
+    by_instance = getattr(_history_buffer, 'by_instance', None)
+    if not by_instance:
+        return []
+    return by_instance.get((history_model, pk), [])
 
 def with_history(history_model: django.db.models.Model,
                  now_field:str=None,
@@ -73,7 +375,8 @@ def with_history(history_model: django.db.models.Model,
                  valid_from_field:str=None, 
                  valid_until_field:str=None, 
                  max_datetime:datetime=None, 
-                 now_func:Callable[[], datetime.datetime]=None):
+                 now_func:Callable[[], datetime.datetime]=None,
+                 check_exists:bool=False):
     """History decorator for Django Model save() method.
 
     Args:
@@ -88,35 +391,191 @@ def with_history(history_model: django.db.models.Model,
                 If not provided, MAX_DATETIME is used.
         now_func (Callable[[], datetime.datetime]): Optional. Function to use to get current date/time.
                 If not provided, use django.utils.timezone.now.
+        check_exists (bool): Optional. Set to True to check for open history records with a SELECT
+                before closing them. By default the closing UPDATE is run unconditionally,
+                which is usually cheaper.
+
+    Inside a history_batch() block history records are collected and created in bulk.
+    Inside a history_timestamp() block its timestamp is used instead of now_field or now_func.
+
+    If the instance is unchanged since it was loaded or saved, the decorated save() does
+    nothing: no query is made and no history record is created. Pass force_history=True
+    to the decorated save() to save anyway and record the history with OperationType.SAVE.
     """
+    # Resolve the options once here instead of branching on them in every save.
+    max_ts = max_datetime or MAX_DATETIME
+    if now_field:
+        get_now = attrgetter(now_field)
+    else:
+        clock = now_func or now
+        def get_now(instance):
+            return clock()
+    close_lookup = f'{valid_until_field}__gt'
+
     def decorator(save):
         @wraps(save)
-        def wrapper_save(self, *args, **kwargs):
-            change_type = find_change_type(self)
-            if change_type in [OperationType.INSERT, OperationType.UPDATE]:
+        def wrapper_save(self, *args, force_history=False, **kwargs):
+            update_fields = kwargs.get('update_fields')
+            change_type = find_change_type(self, update_fields)
+            if change_type is OperationType.SAVE and not force_history:
+                return
+            in_batch = getattr(_history_buffer, 'records', None) is not None
+            collect = in_batch and _collecting_history()
+            # Save and history in one transaction. The UPDATE of the saved row also keeps
+            # it locked until commit, so concurrent saves of it cannot interleave.
+            with transaction.atomic():
                 save(self, *args, **kwargs)
-                if now_field:
-                    now_ts = getattr(self, now_field)
-                else:
-                    now_ts = now_func() if now_func else now()
-                if valid_until_field:
-                    for update in history_model.objects.filter(**{fk_field:self, f'{valid_until_field}__gt':now_ts}):
-                        setattr(update, valid_until_field, now_ts)
-                        update.save()
-                values = field_values(self, False)
-                if fk_field:
-                    values[fk_field] = self
-                if operation_field:
-                    values[operation_field] = change_type.value
-                if valid_from_field:
-                    values[valid_from_field] = now_ts
-                if valid_until_field:
-                    values[valid_until_field] = max_datetime or MAX_DATETIME
-                history_model.objects.create(**values)
+                now_ts = getattr(_history_timestamp, 'value', None) or get_now(self)
+                values = history_values(self, change_type, now_ts, fk_field, operation_field,
+                                        valid_from_field, valid_until_field, max_ts, update_fields)
+                # A new instance has no history records to close.
+                if change_type is not OperationType.INSERT and valid_until_field:
+                    open_records = history_model.objects.filter(**{fk_field:self, close_lookup:now_ts})
+                    if not check_exists or open_records.exists():
+                        open_records.update(**{valid_until_field:now_ts})
+                if not collect:
+                    history_model.objects.create(**values)
+            if in_batch:
+                if change_type is not OperationType.INSERT and valid_until_field:
+                    close_buffered_history(history_model, [self.pk], valid_until_field, now_ts)
+                if collect:
+                    record = history_model(**values)
+                    _history_buffer.records.append(record)
+                    _history_buffer.by_instance.setdefault((history_model, self.pk), []).append(record)
+            remember_state(self, update_fields)
         return wrapper_save
 
     return decorator
 
+def insert_history_raw(history_model: django.db.models.Model, rows, batch_size:int=1000):
+    """Insert history records with cursor.executemany(), without creating model instances.
+
+    Values are only converted with get_db_prep_save(). Field pre_save() hooks, e.g. of
+    auto_now and auto_now_add fields, are not applied, so rows must hold all values to store.
+
+    Args:
+        history_model (django.db.models.Model): Model to be used to store the history.
+        rows (Iterable[dict]): Field values of the records, as returned by history_values().
+                Missing fields get their default value.
+        batch_size (int): Optional. Number of records passed to a single executemany() call.
+    """
+    fields = [f for f in history_model._meta.concrete_fields if not f.primary_key]
+    db_connection = connections[router.db_for_write(history_model)]
+    ops = db_connection.ops
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        ops.quote_name(history_model._meta.db_table),
+        ', '.join(ops.quote_name(f.column) for f in fields),
+        ', '.join(['%s'] * len(fields)))
+    params = []
+    for row in rows:
+        row_params = []
+        for field in fields:
+            value = row[field.name] if field.name in row else field.get_default()
+            if field.is_relation and isinstance(value, models.Model):
+                value = value.pk
+            row_params.append(field.get_db_prep_save(value, db_connection))
+        params.append(row_params)
+    with db_connection.cursor() as cursor:
+        for start in range(0, len(params), batch_size):
+            cursor.executemany(sql, params[start:start + batch_size])
+
+def bulk_save_with_history(model_cls: django.db.models.Model,
+                           history_model: django.db.models.Model,
+                           instances,
+                           now_field:str=None,
+                           fk_field:str=None,
+                           operation_field:str=None,
+                           valid_from_field:str=None,
+                           valid_until_field:str=None,
+                           max_datetime:datetime.datetime=None,
+                           now_func:Callable[[], datetime.datetime]=None,
+                           batch_size:int=1000,
+                           raw_history:bool=False):
+    """Save many instances and maintain their history with a few bulk queries.
+
+    Same outcome as calling a save() decorated with with_history() for each instance,
+    but new instances are saved with bulk_create(), changed ones with bulk_update(),
+    open history records are closed with one UPDATE and new history records are
+    created with bulk_create(). Unchanged instances are skipped.
+
+    Args:
+        model_cls (django.db.models.Model): Model of the instances.
+        history_model (django.db.models.Model): Model to be used to store the history.
+        instances (Iterable[django.db.models.Model]): Instances to save.
+        batch_size (int): Optional. Number of objects created or updated in a single query.
+        raw_history (bool): Optional. Set to True to insert history records with
+                insert_history_raw() instead of bulk_create().
+
+    See with_history() for the rest of the arguments.
+    """
+    instances = list(instances)
+    # Look up the persisted state of instances without one in a single query,
+    # instead of one query per instance in find_change_type().
+    unknown = [instance for instance in instances
+               if instance.pk is not None and getattr(instance, '_original_state', None) is None]
+    if unknown:
+        attnames = model_field_attnames(model_cls)
+        persisted = model_cls.objects.only(*model_field_names(model_cls, False)).in_bulk([i.pk for i in unknown])
+        for instance in unknown:
+            old_instance = persisted.get(instance.pk)
+            if old_instance is not None:
+                instance._original_state = {attname: getattr(old_instance, attname) for attname in attnames}
+    changes = []
+    for instance in instances:
+        if instance.pk is not None and getattr(instance, '_original_state', None) is None:
+            # Primary key is set, but there is no such row.
+            changes.append((instance, OperationType.INSERT))
+        else:
+            changes.append((instance, find_change_type(instance)))
+    inserts = [instance for instance, change_type in changes if change_type is OperationType.INSERT]
+    updates = [instance for instance, change_type in changes if change_type is OperationType.UPDATE]
+    if not inserts and not updates:
+        return
+
+    batch_ts = getattr(_history_timestamp, 'value', None)
+    if batch_ts is not None:
+        now_ts = batch_ts
+    else:
+        now_ts = now_func() if now_func else now()
+    meta = model_cls._meta
+    update_fields = [f.name for f in meta.concrete_fields if not f.primary_key]
+    auto_now_fields = [f.attname for f in meta.concrete_fields if getattr(f, 'auto_now', False)]
+    with transaction.atomic():
+        if connections[router.db_for_write(model_cls)].features.can_return_rows_from_bulk_insert:
+            model_cls.objects.bulk_create(inserts, batch_size=batch_size)
+        else:
+            # Primary keys are needed for the history records.
+            for instance in inserts:
+                models.Model.save(instance)
+        if updates:
+            # bulk_update() does not touch auto_now fields.
+            for instance in updates:
+                for attname in auto_now_fields:
+                    setattr(instance, attname, now_ts)
+            model_cls.objects.bulk_update(updates, update_fields, batch_size=batch_size)
+            if valid_until_field:
+                # Chunked to stay within the database limit on query parameters.
+                update_pks = [u.pk for u in updates]
+                for start in range(0, len(update_pks), batch_size):
+                    history_model.objects.filter(**{f'{fk_field}__in':update_pks[start:start + batch_size],
+                                                    f'{valid_until_field}__gt':now_ts}).update(**{valid_until_field:now_ts})
+        history_rows = []
+        for instance, change_type in changes:
+            if change_type is OperationType.SAVE:
+                continue
+            instance_ts = getattr(instance, now_field) if now_field and batch_ts is None else now_ts
+            history_rows.append(history_values(instance, change_type, instance_ts, fk_field, operation_field,
+                                               valid_from_field, valid_until_field, max_datetime))
+        if raw_history:
+            insert_history_raw(history_model, history_rows, batch_size)
+        else:
+            history_model.objects.bulk_create([history_model(**values) for values in history_rows],
+                                              batch_size=batch_size)
+    if valid_until_field:
+        close_buffered_history(history_model, [u.pk for u in updates], valid_until_field, now_ts)
+    for instance in inserts + updates:
+        remember_state(instance)
+
 
 class TaskUpdate(TaskBaseModel):
     task = models.ForeignKey('Task', on_delete=models.SET_NULL, null=True )
@@ -124,7 +583,13 @@ class TaskUpdate(TaskBaseModel):
     updated_at = models.DateTimeField(auto_now=False)
     operation = models.CharField(max_length=32)
     valid_from = models.DateTimeField()
-    valid_until = models.DateTimeField(default=MAX_DATETIME)
+    valid_until = models.DateTimeField(default=get_max_datetime)
+
+    class Meta:
+        indexes = [
+            # Open history records of a task are looked up on every save and delete.
+            models.Index(fields=['task', 'valid_until'], name='taskupdate_task_vu_idx'),
+        ]
 
 
 class Task(TaskBaseModel):
@@ -133,4 +598,19 @@ class Task(TaskBaseModel):
                   valid_until_field='valid_until')
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
+
+    @classmethod
+    def bulk_save_with_history(cls, instances):
+        """Save many tasks at once, maintaining history the same way save() does."""
+        bulk_save_with_history(cls, TaskUpdate, instances, now_field='updated_at', fk_field='task',
+                               operation_field='operation', valid_from_field='valid_from',
+                               valid_until_field='valid_until')
+
+    @classmethod
+    def raw_bulk_save_with_history(cls, instances):
+        """Same as bulk_save_with_history(), but history records are inserted with raw SQL.
+        Meant for very large loads."""
+        bulk_save_with_history(cls, TaskUpdate, instances, now_field='updated_at', fk_field='task',
+                               operation_field='operation', valid_from_field='valid_from',
+                               valid_until_field='valid_until', raw_history=True)
     
@@ -1,13 +1,20 @@
 from django.db.models.signals import pre_delete
 from django.dispatch import receiver
 from django.utils.timezone import now
-from .models import Task, TaskUpdate
+from .models import Task, TaskUpdate, buffered_history, defer_history_change
 
 @receiver(pre_delete, sender=Task)
 def close_task_updates(sender, instance:Task, **kwargs):
     now_ts = now()
-    for update in TaskUpdate.objects.filter(task=instance, valid_until__gt=now_ts):
-        update.valid_until = now_ts
-        update.save()
+    TaskUpdate.objects.filter(task=instance, valid_until__gt=now_ts).update(valid_until=now_ts)
+    # Records collected by history_batch() are not seen by the delete, so close and unlink them here.
+    staged = list(buffered_history(TaskUpdate, instance.pk))
+    if staged:
+        def unlink():
+            for update in staged:
+                if update.valid_until > now_ts:
+                    update.valid_until = now_ts
+                update.task = None
+        defer_history_change(unlink)
 
 # post_save.connect(close_task_updates, sender=Task)
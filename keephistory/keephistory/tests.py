@@ -0,0 +1,277 @@
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from .models import (MAX_DATETIME, Task, TaskUpdate, bulk_save_with_history, flush_history,
+                     history_batch, history_timestamp, insert_history_raw)
+
+
+def history(task=None):
+    """Get (operation, title, description, open) of history records, oldest first."""
+    records = TaskUpdate.objects.order_by('id')
+    if task is not None:
+        records = records.filter(task=task)
+    return [(r.operation, r.title, r.description, r.valid_until == MAX_DATETIME) for r in records]
+
+
+class PartialSaveTest(TestCase):
+    def test_fields_not_in_update_fields_are_saved_later(self):
+        task = Task(title='a', description='d')
+        task.save()
+        task.title = 'b'
+        task.description = 'changed'
+        task.save(update_fields=['title'])
+        task.save()
+        task = Task.objects.get(pk=task.pk)
+        self.assertEqual((task.title, task.description), ('b', 'changed'))
+
+    def test_loaded_task_fields_not_in_update_fields_are_saved_later(self):
+        Task(title='a', description='d').save()
+        task = Task.objects.get()
+        task.title = 'b'
+        task.description = 'changed'
+        task.save(update_fields=['title'])
+        self.assertEqual(task.get_dirty_fields(), {'description'})
+        task.save()
+        self.assertEqual(Task.objects.values_list('title', 'description').get(), ('b', 'changed'))
+
+    def test_history_records_persisted_values_of_fields_not_saved(self):
+        task = Task(title='a', description='d')
+        task.save()
+        task.title = 'b'
+        task.description = 'changed'
+        task.save(update_fields=['title'])
+        self.assertEqual(history(task), [('I', 'a', 'd', False), ('U', 'b', 'd', True)])
+
+    def test_change_outside_update_fields_is_not_saved(self):
+        task = Task(title='a', description='d')
+        task.save()
+        task.description = 'changed'
+        with self.assertNumQueries(0):
+            task.save(update_fields=['title'])
+        self.assertEqual(len(history(task)), 1)
+
+    def test_task_without_remembered_state_is_compared_once(self):
+        task = Task(title='a', description='d')
+        task.save()
+        copy = Task(id=task.pk, title='a', description='d',
+                    created_at=task.created_at, updated_at=task.updated_at)
+        with self.assertNumQueries(1):
+            copy.save()
+            copy.save()
+        copy.title = 'b'
+        copy.save()
+        self.assertEqual(history(task), [('I', 'a', 'd', False), ('U', 'b', 'd', True)])
+
+
+class SaveWithHistoryTest(TestCase):
+    def test_unchanged_loaded_task_is_not_saved(self):
+        Task(title='a').save()
+        task = Task.objects.get()
+        with self.assertNumQueries(0):
+            task.save()
+        self.assertEqual(history(), [('I', 'a', None, True)])
+
+    def test_force_history_saves_unchanged_task(self):
+        task = Task(title='a')
+        task.save()
+        updated_at = task.updated_at
+        task.save(force_history=True)
+        self.assertGreater(Task.objects.get(pk=task.pk).updated_at, updated_at)
+        self.assertEqual(history(task), [('I', 'a', None, False), ('S', 'a', None, True)])
+
+
+class HistoryBatchTest(TestCase):
+    def test_repeated_saves_leave_one_open_record(self):
+        tasks = [Task(title='a'), Task(title='b')]
+        with history_batch():
+            for task in tasks:
+                task.save()
+            for title in ('a1', 'a2', 'a3'):
+                tasks[0].title = title
+                tasks[0].save()
+            self.assertEqual(TaskUpdate.objects.count(), 0)
+        self.assertEqual(history(tasks[0]), [('I', 'a', None, False), ('U', 'a1', None, False),
+                                             ('U', 'a2', None, False), ('U', 'a3', None, True)])
+        self.assertEqual(history(tasks[1]), [('I', 'b', None, True)])
+
+    def test_records_are_created_in_batches(self):
+        with history_batch(batch_size=2):
+            for title in 'abcde':
+                Task(title=title).save()
+            with self.assertNumQueries(3):
+                flush_history()
+        self.assertEqual(TaskUpdate.objects.count(), 5)
+
+    def test_bulk_save_in_batch_closes_collected_record(self):
+        task = Task(title='a')
+        with history_batch():
+            task.save()
+            task.title = 'a1'
+            Task.bulk_save_with_history([task])
+        self.assertCountEqual(history(task), [('I', 'a', None, False), ('U', 'a1', None, True)])
+
+    def test_saves_and_records_are_discarded_on_error(self):
+        with self.assertRaises(ValueError):
+            with history_batch():
+                Task(title='a').save()
+                raise ValueError()
+        self.assertEqual(TaskUpdate.objects.count(), 0)
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_get_or_create_and_update_or_create_in_batch(self):
+        task = Task(title='a')
+        with history_batch():
+            task.save()
+            other, created = Task.objects.get_or_create(title='b')
+            self.assertTrue(created)
+            Task.objects.update_or_create(pk=task.pk, defaults={'title': 'a1'})
+        self.assertEqual(history(other), [('I', 'b', None, True)])
+        self.assertCountEqual(history(task), [('I', 'a', None, False), ('U', 'a1', None, True)])
+
+    def test_rolled_back_savepoint_discards_its_saves_and_records(self):
+        task = Task(title='a')
+        with history_batch():
+            task.save()
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    task.title = 'a1'
+                    task.save()
+                    Task(title='b').save()
+                    raise ValueError()
+        self.assertEqual(history(), [('I', 'a', None, True)])
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ['a'])
+
+    def test_committed_savepoint_keeps_its_records(self):
+        task = Task(title='a')
+        with history_batch():
+            task.save()
+            with transaction.atomic():
+                task.title = 'a1'
+                task.save()
+        self.assertCountEqual(history(task), [('I', 'a', None, False), ('U', 'a1', None, True)])
+
+    def test_delete_unlinks_collected_records(self):
+        task = Task(title='a')
+        other = Task(title='b')
+        with history_batch():
+            task.save()
+            other.save()
+            task.title = 'a1'
+            task.save()
+            task.delete()
+        self.assertEqual(history(), [('I', 'a', None, False), ('I', 'b', None, True), ('U', 'a1', None, False)])
+        self.assertEqual(TaskUpdate.objects.filter(task=None).count(), 2)
+
+    def test_delete_in_rolled_back_savepoint_keeps_records_linked(self):
+        task = Task(title='a')
+        with history_batch():
+            task.save()
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    Task.objects.get(pk=task.pk).delete()
+                    raise ValueError()
+        self.assertEqual(history(task), [('I', 'a', None, True)])
+
+
+class HistoryTimestampTest(TestCase):
+    def test_saves_use_one_timestamp(self):
+        task = Task(title='a')
+        with history_timestamp() as now_ts:
+            task.save()
+            Task(title='b').save()
+        self.assertEqual(set(TaskUpdate.objects.values_list('valid_from', flat=True)), {now_ts})
+
+    def test_repeated_save_leaves_record_valid_for_no_time(self):
+        task = Task(title='a')
+        with history_timestamp() as now_ts:
+            task.save()
+            task.title = 'a1'
+            task.save()
+        first, last = TaskUpdate.objects.order_by('id')
+        self.assertEqual((first.valid_from, first.valid_until), (now_ts, now_ts))
+        self.assertEqual((last.valid_from, last.valid_until), (now_ts, MAX_DATETIME))
+
+    def test_bulk_save_uses_given_timestamp(self):
+        task = Task(title='a')
+        task.save()
+        task.title = 'a1'
+        now_ts = now()
+        with history_timestamp(now_ts):
+            Task.bulk_save_with_history([task, Task(title='b')])
+        self.assertEqual(TaskUpdate.objects.get(task=task, operation='I').valid_until, now_ts)
+        self.assertEqual(set(TaskUpdate.objects.filter(valid_until=MAX_DATETIME).values_list('valid_from', flat=True)),
+                         {now_ts})
+
+
+class BulkSaveWithHistoryTest(TestCase):
+    def test_inserts_updates_and_skips_unchanged(self):
+        changed = Task(title='a')
+        unchanged = Task(title='b')
+        changed.save()
+        unchanged.save()
+        updated_at = changed.updated_at
+        changed.title = 'a1'
+        new = Task(title='c')
+        Task.bulk_save_with_history([changed, unchanged, new])
+        self.assertEqual(list(Task.objects.order_by('id').values_list('title', flat=True)), ['a1', 'b', 'c'])
+        self.assertGreater(Task.objects.get(pk=changed.pk).updated_at, updated_at)
+        self.assertEqual(history(changed), [('I', 'a', None, False), ('U', 'a1', None, True)])
+        self.assertEqual(history(unchanged), [('I', 'b', None, True)])
+        self.assertEqual(history(new), [('I', 'c', None, True)])
+
+    def test_saved_tasks_are_not_saved_again(self):
+        tasks = [Task(title='a'), Task(title='b')]
+        Task.bulk_save_with_history(tasks)
+        with self.assertNumQueries(0):
+            Task.bulk_save_with_history(tasks)
+            tasks[0].save()
+
+    def test_detached_tasks_are_looked_up_in_one_query(self):
+        tasks = [Task(title=str(i)) for i in range(5)]
+        Task.bulk_save_with_history(tasks)
+        detached = [Task(id=task.pk, title=task.title, created_at=task.created_at, updated_at=task.updated_at)
+                    for task in tasks]
+        detached[0].title = 'changed'
+        missing = Task(id=tasks[-1].pk + 100, title='new')
+        with CaptureQueriesContext(connection) as queries:
+            Task.bulk_save_with_history(detached + [missing])
+        selects = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 1)
+        self.assertEqual(history(detached[0]), [('I', '0', None, False), ('U', 'changed', None, True)])
+        self.assertEqual(history(detached[1]), [('I', '1', None, True)])
+        self.assertEqual(history(missing), [('I', 'new', None, True)])
+
+    def test_closes_history_in_batches(self):
+        tasks = [Task(title=str(i)) for i in range(5)]
+        Task.bulk_save_with_history(tasks)
+        for task in tasks:
+            task.title += 'x'
+        bulk_save_with_history(Task, TaskUpdate, tasks, now_field='updated_at', fk_field='task',
+                               operation_field='operation', valid_from_field='valid_from',
+                               valid_until_field='valid_until', batch_size=2)
+        self.assertEqual(TaskUpdate.objects.filter(valid_until=MAX_DATETIME).count(), 5)
+        self.assertEqual(set(TaskUpdate.objects.filter(valid_until=MAX_DATETIME).values_list('title', flat=True)),
+                         {task.title for task in tasks})
+
+    def test_raw_history_matches_bulk_create(self):
+        task = Task(title='a', description='d')
+        task.save()
+        task.title = 'a1'
+        Task.raw_bulk_save_with_history([task, Task(title='b')])
+        self.assertEqual(history(), [('I', 'a', 'd', False), ('U', 'a1', 'd', True), ('I', 'b', None, True)])
+
+
+class InsertHistoryRawTest(TestCase):
+    def test_inserts_rows(self):
+        task = Task(title='a')
+        task.save()
+        now_ts = now()
+        rows = [{'title': f't{i}', 'description': None, 'created_at': now_ts, 'updated_at': now_ts,
+                 'task': task, 'operation': 'U', 'valid_from': now_ts} for i in range(3)]
+        with self.assertNumQueries(2):
+            insert_history_raw(TaskUpdate, rows, batch_size=2)
+        records = TaskUpdate.objects.filter(title__startswith='t').order_by('id')
+        self.assertEqual([(r.title, r.task_id, r.valid_from, r.valid_until) for r in records],
+                         [(f't{i}', task.pk, now_ts, MAX_DATETIME) for i in range(3)])